@@ -271,6 +271,10 @@ class DfNet(nn.Module):
         feat_spec: Tensor,  # Not used, take spec modified by mask instead
         atten_lim: Optional[Tensor] = None,
     ) -> Tuple[Tensor, Tensor, Tensor, Tensor]:
+        # Real valued inputs, complex spectrograms are provided as real views:
+        #   spec: [B, 1, T, F, 2], F: freq bin
+        #   feat_erb: [B, 1, T, E], E: ERB bands
+        #   feat_spec: [B, 1, T, C, 2], C: Complex features
         feat_spec = feat_spec.transpose(1, 4).squeeze(4)  # re/im into channel axis
         e0, e1, e2, e3, emb, c0, lsnr = self.enc(feat_erb, feat_spec)
         m = self.erb_dec(emb, e3, e2, e1, e0)
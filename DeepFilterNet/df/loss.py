@@ -436,7 +436,7 @@ class Loss(nn.Module):
         df_alpha: Optional[Tensor],
         snrs: Tensor,
         max_freq: Optional[Tensor] = None,
-    ):
+    ) -> Tensor:
         max_bin: Optional[Tensor] = None
         if max_freq is not None:
             max_bin = (
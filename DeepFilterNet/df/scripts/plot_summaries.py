@@ -67,7 +67,7 @@ def plot(f, ax, summary_dir, snr, update_handle=None) -> int:
     spec_figure(ideal, sr, from_audio=True, ax=ax[2], figure=f, ylabel="Frequency [kHz]", kHz=True)
     enh, sr = torchaudio.load(os.path.join(summary_dir, f"enh_snr{snr}.wav"))
     spec_figure(enh, sr, from_audio=True, ax=ax[3], figure=f, ylabel="Frequency [kHz]", kHz=True)
-    lsnr = np.loadtxt(os.path.join(summary_dir, f"lsnr_snr{snr}.txt"))
+    lsnr = np.load(os.path.join(summary_dir, f"lsnr_snr{snr}.npy"))
     T = enh.shape[-1] / sr
     t = np.linspace(0, T, lsnr.shape[-1])
     if update_handle is not None:
@@ -79,7 +79,7 @@ def plot(f, ax, summary_dir, snr, update_handle=None) -> int:
         h.extend(ax[4].plot(t, lsnr, "b", label="lsnr"))
         ax[4].set_ylim(-15, 30)
     try:
-        df_alpha = np.loadtxt(os.path.join(summary_dir, f"df_alpha_snr{snr}.txt"))
+        df_alpha = np.load(os.path.join(summary_dir, f"df_alpha_snr{snr}.npy"))
         ax_a = ax[4].twinx()
         if update_handle is not None:
             h[1].set_ydata(df_alpha)
@@ -1,7 +1,9 @@
 import argparse
+import inspect
 import os
 import signal
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional
 
 import numpy as np
 import torch
@@ -19,21 +21,23 @@ from df.model import ModelParams
 from df.modules import get_device
 from df.utils import (
     as_complex,
-    as_real,
     check_finite_module,
     check_manual_seed,
     clip_grad_norm_,
-    detach_hidden,
+    detach_hidden_refs,
+    get_hidden_refs,
     get_norm_alpha,
     make_np,
 )
 from libdf import DF
 from libdfdata import PytorchDataLoader as DataLoader
+from libdfdata.torch_dataloader import Batch
 
 should_stop = False
 debug = False
 state: Optional[DF] = None
 istft: Optional[nn.Module]
+_summary_executor = ThreadPoolExecutor(max_workers=1)
 
 
 @logger.catch
@@ -65,6 +69,14 @@ def main():
     seed = config("SEED", 42, int, section="train")
     check_manual_seed(seed)
     logger.info("Running on device {}".format(get_device()))
+    overfit = config("OVERFIT", False, bool, section="train")
+    # Input shapes are static for a given MAX_SAMPLE_LEN_S, so cudnn can pick algorithms once
+    if config("CUDNN_BENCHMARK", True, bool, section="train") and not overfit:
+        torch.backends.cudnn.benchmark = True
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        if hasattr(torch, "set_float32_matmul_precision"):
+            torch.set_float32_matmul_precision("high")
 
     signal.signal(signal.SIGUSR1, get_sigusr1_handler(args.base_dir))
 
@@ -98,22 +110,41 @@ def main():
         log_model_summary(model, verbose=args.debug)
     except Exception as e:
         logger.warning(f"Failed to print model summary: {e}")
-    if jit:
-        # Load as jit after log_model_summary
-        model = torch.jit.script(model)
-
     bs: int = config("BATCH_SIZE", 1, int, section="train")
     bs_eval: int = config("BATCH_SIZE_EVAL", 0, int, section="train")
     bs_eval = bs_eval if bs_eval > 0 else bs
-    overfit = config("OVERFIT", False, bool, section="train")
+    max_len_s = config("MAX_SAMPLE_LEN_S", 5.0, float, section="train")
+    # Use at least the previous default of 4 workers
+    default_workers = min(os.cpu_count() or 1, max(4, 2 * torch.cuda.device_count()))
+    num_workers = config("NUM_WORKERS", default_workers, int, section="train")
+    # Number of prefetched batches per worker
+    prefetch = config("PREFETCH", 2, int, section="train")
+    if config("CHANNELS_LAST", False, cast=bool, section="train"):
+        model = model.to(memory_format=torch.channels_last)
+    compile_model = config("COMPILE", False, cast=bool, section="train")
+    if compile_model and not hasattr(torch, "compile"):
+        logger.warning(f"torch.compile is not supported by torch {torch.__version__}")
+        compile_model = False
+    if compile_model:
+        if jit:
+            logger.warning("Both `JIT` and `COMPILE` are enabled. Ignoring `JIT`.")
+        # Compile after log_model_summary
+        model = torch.compile(model, mode="reduce-overhead", fullgraph=False, dynamic=False)
+    elif jit:
+        logger.warning(
+            "Config option `JIT` is deprecated. Set `COMPILE = true` instead (requires torch 2.0)."
+        )
+        # Load as jit after log_model_summary
+        model = torch.jit.script(model)
+        warmup_jit(model, bs, max_len_s)
     dataloader = DataLoader(
         ds_dir=args.data_dir,
         ds_config=args.data_config_file,
         sr=p.sr,
         batch_size=bs,
         batch_size_eval=bs_eval,
-        num_workers=config("NUM_WORKERS", 4, int, section="train"),
-        max_len_s=config("MAX_SAMPLE_LEN_S", 5.0, float, section="train"),
+        num_workers=num_workers,
+        max_len_s=max_len_s,
         fft_size=p.fft_size,
         hop_size=p.hop_size,
         nb_erb=p.nb_erb,
@@ -121,10 +152,11 @@ def main():
         norm_alpha=get_norm_alpha(),
         p_atten_lim=config("p_atten_lim", 0.2, float, section="train"),
         p_reverb=config("p_reverb", 0.2, float, section="train"),
-        prefetch=10,
+        prefetch=prefetch,
         overfit=overfit,
         seed=seed,
         min_nb_erb_freqs=p.min_nb_freqs,
+        output_real_view=True,
     )
 
     max_epochs = config("MAX_EPOCHS", 10, int, section="train")
@@ -150,7 +182,7 @@ def main():
 
     if config("START_EVAL", False, cast=bool, section="train"):
         val_loss = run_epoch(
-            model=model,
+            model=inference_model(model),
             epoch=epoch - 1,
             loader=dataloader,
             split="valid",
@@ -159,9 +191,7 @@ def main():
             summary_dir=summary_dir,
         )
         metrics = {"loss": val_loss}
-        metrics.update(
-            {n: torch.mean(torch.stack(vals)).item() for n, vals in losses.get_summaries()}
-        )
+        metrics.update(summary_means(losses))
         log_metrics(f"[{epoch - 1}] [valid]", metrics)
     losses.reset_summaries()
     # Save default values to disk
@@ -182,15 +212,14 @@ def main():
         except AttributeError:
             pass
         if debug:
-            metrics.update(
-                {n: torch.mean(torch.stack(vals)).item() for n, vals in losses.get_summaries()}
-            )
+            metrics.update(summary_means(losses))
         log_metrics(f"[{epoch}] [train]", metrics)
-        write_cp(model, "model", checkpoint_dir, epoch + 1)
+        # Compiled models wrap the original module, whose state dict keys we want to store
+        write_cp(getattr(model, "_orig_mod", model), "model", checkpoint_dir, epoch + 1)
         write_cp(opt, "opt", checkpoint_dir, epoch + 1)
         losses.reset_summaries()
         val_loss = run_epoch(
-            model=model,
+            model=inference_model(model),
             epoch=epoch,
             loader=dataloader,
             split="valid",
@@ -199,9 +228,7 @@ def main():
             summary_dir=summary_dir,
         )
         metrics = {"loss": val_loss}
-        metrics.update(
-            {n: torch.mean(torch.stack(vals)).item() for n, vals in losses.get_summaries()}
-        )
+        metrics.update(summary_means(losses))
         log_metrics(f"[{epoch}] [valid]", metrics)
         if should_stop:
             logger.info("Stopping training")
@@ -210,7 +237,7 @@ def main():
         lrs.step()
         ic([group["lr"] for group in opt.param_groups])
     test_loss = run_epoch(
-        model=model,
+        model=inference_model(model),
         epoch=epoch,
         loader=dataloader,
         split="test",
@@ -219,11 +246,25 @@ def main():
         summary_dir=summary_dir,
     )
     metrics: Dict[str, Number] = {"loss": test_loss}
-    metrics.update({n: torch.mean(torch.stack(vals)).item() for n, vals in losses.get_summaries()})
+    metrics.update(summary_means(losses))
     log_metrics(f"[{epoch}] [test]", metrics)
     logger.info("Finished training")
 
 
+def inference_model(model: nn.Module) -> nn.Module:
+    """Returns a frozen and inference optimized copy of a scripted model for evaluation.
+
+    Since the copy does not share the weights, it needs to be rebuilt after each training epoch.
+    """
+    if not isinstance(model, torch.jit.ScriptModule):
+        return model
+    try:
+        return torch.jit.optimize_for_inference(torch.jit.freeze(model.eval()))
+    except Exception as e:
+        logger.warning(f"Could not freeze model for evaluation: {e}")
+        return model
+
+
 def run_epoch(
     model: nn.Module,
     epoch: int,
@@ -246,34 +287,59 @@ def run_epoch(
     if detect_anomaly:
         logger.info("Running with autograd profiling")
     dev = get_device()
-    l_mem = []
+    # Ring buffer of the last 100 losses for logging
+    l_mem = torch.zeros(100, device=dev)
+    l_mem_idx = 0
+    l_mem_full = False
+    epoch_loss_sum = torch.zeros((), device=dev)
+    epoch_loss_count = 0
     is_train = split == "train"
+    amp_dtype_name = config("AMP_DTYPE", "bfloat16", str, section="train").lower()
+    if amp_dtype_name not in ("float32", "float16", "bfloat16"):
+        raise ValueError(
+            f"Unsupported AMP_DTYPE: {amp_dtype_name}. Must be one of float32, float16, bfloat16"
+        )
+    amp_dtype = getattr(torch, amp_dtype_name)
+    if is_train and amp_dtype == torch.bfloat16 and dev.type == "cuda":
+        if not getattr(torch.cuda, "is_bf16_supported", lambda: False)():
+            logger.warning("bfloat16 is not supported on this device. Disabling autocast.")
+            amp_dtype = torch.float32
+    # Mixed precision training is only used on CUDA devices
+    use_amp = is_train and dev.type == "cuda" and amp_dtype != torch.float32
+    scaler = torch.cuda.amp.GradScaler(enabled=use_amp and amp_dtype == torch.float16)
     summary_fn = summary_write  # or summary_noop
     model.train(mode=is_train)
+    hidden_refs = get_hidden_refs(model)
     losses.store_losses = debug or not is_train
     max_steps = loader.len(split) - 1
     seed = epoch if is_train else 42
     n_nans = 0
     logger.info("Dataloader len: {}".format(loader.len(split)))
 
-    for i, batch in enumerate(loader.iter_epoch(split, seed)):
-        opt.zero_grad()
+    channels_last = config("CHANNELS_LAST", False, cast=bool, section="train")
+    prefetcher = CUDAPrefetcher(loader.iter_epoch(split, seed), dev, channels_last)
+    for i, batch in enumerate(prefetcher):
+        opt.zero_grad(set_to_none=True)
         assert batch.feat_spec is not None
         assert batch.feat_erb is not None
-        feat_erb = batch.feat_erb.to(dev, non_blocking=True)
-        feat_spec = as_real(batch.feat_spec.to(dev, non_blocking=True))
-        noisy = batch.noisy.to(dev, non_blocking=True)
-        clean = batch.speech.to(dev, non_blocking=True)
-        atten = batch.atten.to(dev, non_blocking=True)
+        feat_erb = batch.feat_erb
+        feat_spec = batch.feat_spec
+        noisy = as_complex(batch.noisy)
+        clean = batch.speech
+        atten = batch.atten
         snrs = batch.snr.to(dev, non_blocking=True)
         with torch.autograd.set_detect_anomaly(detect_anomaly):
-            with torch.set_grad_enabled(is_train):
+            with torch.set_grad_enabled(is_train), torch.autocast(
+                dev.type, dtype=amp_dtype, enabled=use_amp
+            ):
                 enh, m, lsnr, df_alpha = model.forward(
-                    spec=as_real(noisy),
+                    spec=batch.noisy,
                     feat_erb=feat_erb,
                     feat_spec=feat_spec,
                     atten_lim=atten,
                 )
+            # Compute the losses, including the target masks, in full precision
+            enh, m, lsnr, df_alpha = enh.float(), m.float(), lsnr.float(), df_alpha.float()
             try:
                 err = losses.forward(
                     clean,
@@ -288,7 +354,7 @@ def run_epoch(
             except Exception as e:
                 if "nan" in str(e).lower() or "finite" in str(e).lower():
                     logger.warning("NaN in loss computation: {}. Skipping backward.".format(str(e)))
-                    check_finite_module(model)
+                    log_non_finite(model)
                     n_nans += 1
                     if n_nans > 10:
                         raise e
@@ -296,13 +362,16 @@ def run_epoch(
                 raise e
             if is_train:
                 try:
-                    err.backward()
-                    clip_grad_norm_(model.parameters(), 1.0, error_if_nonfinite=True)
+                    scaler.scale(err).backward()
+                    scaler.unscale_(opt)
+                    # Non-finite gradients of fp16 overflows are handled by the grad scaler
+                    clip_grad_norm_(
+                        model.parameters(), 1.0, error_if_nonfinite=not scaler.is_enabled()
+                    )
                 except RuntimeError as e:
                     e_str = str(e)
                     if "nan" in e_str.lower() or "non-finite" in e_str:
-                        check_finite_module(model)
-                        cleanup(err, noisy, clean, enh, m, feat_erb, feat_spec, batch)
+                        log_non_finite(model)
                         logger.error(e_str)
                         n_nans += 1
                         if n_nans > 10:
@@ -310,38 +379,138 @@ def run_epoch(
                         continue
                     else:
                         raise e
-                opt.step()
-            detach_hidden(model)
-        l_mem.append(err.detach())
+                scaler.step(opt)
+                scaler.update()
+            detach_hidden_refs(hidden_refs)
+        l_mem[l_mem_idx] = err.detach()
+        l_mem_idx = (l_mem_idx + 1) % len(l_mem)
+        l_mem_full = l_mem_full or l_mem_idx == 0
+        epoch_loss_sum += err.detach()
+        epoch_loss_count += 1
         if i % log_freq == 0:
-            l_mean = torch.stack(l_mem[-100:]).mean().cpu()
-            if torch.isnan(l_mean):
-                check_finite_module(model)
+            l_mean = l_mem[: len(l_mem) if l_mem_full else l_mem_idx].mean().cpu()
             l_dict = {"loss": l_mean.item()}
             if debug:
-                l_dict.update(
-                    {
-                        n: torch.mean(torch.stack(vals[-bs:])).item()
-                        for n, vals in losses.get_summaries()
-                    }
-                )
+                l_dict.update(summary_means(losses, last_n=bs))
             log_metrics(f"[{epoch}] [{i}/{max_steps}]", l_dict)
             summary_fn(
                 clean,
                 noisy,
                 enh,
-                batch.snr,
+                batch.snr[0].item(),
                 lsnr,
                 df_alpha,
                 summary_dir,
                 mask_loss=losses.ml,
                 split=split,
             )
-    try:
-        cleanup(err, noisy, clean, enh, m, feat_erb, feat_spec, batch)
-    except UnboundLocalError as err:
-        logger.error(str(err))
-    return torch.stack(l_mem).mean().cpu().item()
+    if epoch_loss_count == 0:
+        logger.warning(f"No valid {split} batches in epoch {epoch}")
+        return float("nan")
+    return (epoch_loss_sum / epoch_loss_count).item()
+
+
+def log_non_finite(model: nn.Module):
+    non_finite = check_finite_module(model, _raise=False)
+    if len(non_finite) > 0:
+        logger.error(f"Non-finite model parameters or buffers: {non_finite}")
+
+
+def summary_means(losses: Loss, last_n: Optional[int] = None) -> Dict[str, float]:
+    """Averages the stored loss summaries with a single device to host transfer."""
+    summaries = [(n, vals[-last_n:] if last_n else vals) for n, vals in losses.get_summaries()]
+    if len(summaries) == 0:
+        return {}
+    values = torch.cat([v.view(-1) for _, vals in summaries for v in vals]).float().cpu()
+    lengths = [sum(v.numel() for v in vals) for _, vals in summaries]
+    means = torch.stack([x.mean() for x in values.split(lengths)]).tolist()
+    return {n: m for (n, _), m in zip(summaries, means)}
+
+
+class CUDAPrefetcher:
+    """Transfers the next batch to the device while the current one is processed.
+
+    The host to device copies are issued on a separate CUDA stream. On CPU, the batch is moved
+    synchronously. If `channels_last` is set, 4D real valued inputs are converted to the
+    channels last memory format.
+    """
+
+    # `snr` stays on the host, e.g. for summary file names
+    fields = ("feat_erb", "feat_spec", "noisy", "speech", "atten")
+
+    def __init__(self, loader: Iterator[Batch], device: torch.device, channels_last: bool = False):
+        self.loader = loader
+        self.device = device
+        self.channels_last = channels_last
+        self.stream = torch.cuda.Stream(device) if device.type == "cuda" else None
+        self.batch: Optional[Batch] = None
+        self._preload()
+
+    def _preload(self):
+        try:
+            self.batch = next(self.loader)
+        except StopIteration:
+            self.batch = None
+            return
+        if self.stream is None:
+            for name in self.fields:
+                x = getattr(self.batch, name)
+                if x is not None:
+                    setattr(self.batch, name, self._to_memory_format(x.to(self.device)))
+        else:
+            with torch.cuda.stream(self.stream):
+                for name in self.fields:
+                    x = getattr(self.batch, name)
+                    if x is None:
+                        continue
+                    if not x.is_pinned():
+                        x = x.pin_memory()
+                    x = x.to(self.device, non_blocking=True)
+                    setattr(self.batch, name, self._to_memory_format(x))
+
+    def _to_memory_format(self, x: Tensor) -> Tensor:
+        if self.channels_last and x.dim() == 4 and x.is_floating_point():
+            return x.contiguous(memory_format=torch.channels_last)
+        return x
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Batch:
+        batch = self.batch
+        if batch is None:
+            raise StopIteration
+        if self.stream is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(self.stream)
+            for name in self.fields:
+                x = getattr(batch, name)
+                if x is not None:
+                    x.record_stream(current_stream)
+        self._preload()
+        return batch
+
+
+@torch.no_grad()
+def warmup_jit(model: nn.Module, batch_size: int, max_len_s: float, n_iters: int = 2):
+    """Run a few forward passes with training shaped inputs to specialize the JIT fuser."""
+    if get_device().type == "cuda" and hasattr(torch._C, "_jit_set_nvfuser_enabled"):
+        torch._C._jit_set_nvfuser_enabled(True)
+    else:
+        torch._C._jit_set_texpr_fuser_enabled(True)
+    p = ModelParams()
+    b = batch_size
+    t = int(max_len_s * p.sr / p.hop_size)
+    device = get_device()
+    spec = torch.randn([b, 1, t, p.fft_size // 2 + 1, 2], device=device)
+    feat_erb = torch.randn([b, 1, t, p.nb_erb], device=device)
+    feat_spec = torch.randn([b, 1, t, p.nb_df, 2], device=device)
+    # Restore buffers afterwards, since e.g. batch norm statistics are updated in training mode
+    buffers = {n: buf.clone() for n, buf in model.named_buffers()}
+    for _ in range(n_iters):
+        model(spec=spec, feat_erb=feat_erb, feat_spec=feat_spec)
+    for n, buf in model.named_buffers():
+        buf.copy_(buffers[n])
 
 
 def setup_losses() -> Loss:
@@ -350,11 +519,18 @@ def setup_losses() -> Loss:
 
     p = ModelParams()
 
-    istft = Istft(p.fft_size, p.hop_size, torch.as_tensor(state.fft_window().copy())).to(
-        get_device()
-    )
+    window = torch.from_numpy(np.ascontiguousarray(state.fft_window())).to(get_device())
+    istft = Istft(p.fft_size, p.hop_size, window)
     loss = Loss(state, istft).to(get_device())
-    # loss = torch.jit.script(loss)
+    # The Loss container keeps python side summaries, thus only script the individual loss terms.
+    for name in ("lsnr", "ml", "sl", "mrsl", "cal"):
+        module = getattr(loss, name)
+        if module is None:
+            continue
+        try:
+            setattr(loss, name, torch.jit.script(module))
+        except Exception as e:
+            logger.debug(f"Could not script {module.__class__.__name__}, running eager: {e}")
     return loss
 
 
@@ -375,11 +551,20 @@ def load_opt(
         params = (p for n, p in model.named_parameters() if "df" in n.lower())
     else:
         params = model.parameters()
+    # Use the fused/multi-tensor implementations if supported by the installed torch version
+    fused: Dict[str, bool] = {}
+    if get_device().type == "cuda" and _supports_kwarg(optim.AdamW, "fused"):
+        fused["fused"] = True
+    foreach = {"foreach": True} if _supports_kwarg(optim.SGD, "foreach") else {}
     supported = {
-        "adam": lambda p: optim.AdamW(p, lr=lr, weight_decay=decay, betas=betas),
-        "adamw": lambda p: optim.AdamW(p, lr=lr, weight_decay=decay, betas=betas),
-        "sgd": lambda p: optim.SGD(p, lr=lr, momentum=momentum, nesterov=True, weight_decay=decay),
-        "rmsprop": lambda p: optim.RMSprop(params, lr=lr, momentum=momentum, weight_decay=decay),
+        "adam": lambda p: optim.AdamW(p, lr=lr, weight_decay=decay, betas=betas, **fused),
+        "adamw": lambda p: optim.AdamW(p, lr=lr, weight_decay=decay, betas=betas, **fused),
+        "sgd": lambda p: optim.SGD(
+            p, lr=lr, momentum=momentum, nesterov=True, weight_decay=decay, **foreach
+        ),
+        "rmsprop": lambda p: optim.RMSprop(
+            p, lr=lr, momentum=momentum, weight_decay=decay, **foreach
+        ),
     }
     if optimizer not in supported:
         raise ValueError(
@@ -397,51 +582,64 @@ def load_opt(
     return opt
 
 
+def _supports_kwarg(cls, name: str) -> bool:
+    return name in inspect.signature(cls).parameters
+
+
 @torch.no_grad()
 def summary_write(
     clean: Tensor,
     noisy: Tensor,
     enh: Tensor,
-    snrs: Tensor,
+    snr: float,
     lsnr: Tensor,
     df_alpha: Tensor,
     summary_dir: str,
     mask_loss: Optional[MaskLoss] = None,
     split="train",
 ):
-    global state
-    assert state is not None
-
     p = ModelParams()
-    snr = snrs[0].detach().cpu().item()
-
-    def synthesis(x: Tensor) -> Tensor:
-        return torch.as_tensor(state.synthesis(make_np(as_complex(x.detach()))))
-
+    specs: Dict[str, Tensor] = {}
     if mask_loss is not None:
         ideal = mask_loss.erb_mask_compr(clean[0], noisy[0], compressed=False)
-        ideal = noisy[0] * mask_loss.erb_inv(ideal)
-        torchaudio.save(
-            os.path.join(summary_dir, f"{split}_idealmask_snr{snr}.wav"), synthesis(ideal), p.sr
-        )
-    torchaudio.save(
-        os.path.join(summary_dir, f"{split}_clean_snr{snr}.wav"), synthesis(clean[0]), p.sr
-    )
-    torchaudio.save(
-        os.path.join(summary_dir, f"{split}_noisy_snr{snr}.wav"), synthesis(noisy[0]), p.sr
-    )
-    torchaudio.save(os.path.join(summary_dir, f"{split}_enh_snr{snr}.wav"), synthesis(enh[0]), p.sr)
-    np.savetxt(
-        os.path.join(summary_dir, f"{split}_lsnr_snr{snr}.txt"),
-        lsnr[0].detach().cpu().numpy(),
-        fmt="%.3f",
-    )
-    np.savetxt(
-        os.path.join(summary_dir, f"{split}_df_alpha_snr{snr}.txt"),
-        df_alpha[0].detach().cpu().numpy(),
+        specs["idealmask"] = noisy[0] * mask_loss.erb_inv(ideal)
+    specs["clean"] = clean[0]
+    specs["noisy"] = noisy[0]
+    specs["enh"] = enh[0]
+    # Synthesis and writing is done in a background thread
+    specs = {n: as_complex(x.detach()).cpu() for n, x in specs.items()}
+    _summary_executor.submit(
+        _write_summary,
+        specs,
+        lsnr[0].detach().float().cpu(),
+        df_alpha[0].detach().float().cpu(),
+        snr,
+        split,
+        summary_dir,
+        p.sr,
     )
 
 
+@logger.catch
+def _write_summary(
+    specs: Dict[str, Tensor],
+    lsnr: Tensor,
+    df_alpha: Tensor,
+    snr: float,
+    split: str,
+    summary_dir: str,
+    sr: int,
+):
+    global state
+    assert state is not None
+
+    for name, spec in specs.items():
+        audio = torch.as_tensor(state.synthesis(make_np(spec)))
+        torchaudio.save(os.path.join(summary_dir, f"{split}_{name}_snr{snr}.wav"), audio, sr)
+    np.save(os.path.join(summary_dir, f"{split}_lsnr_snr{snr}.npy"), lsnr.numpy())
+    np.save(os.path.join(summary_dir, f"{split}_df_alpha_snr{snr}.npy"), df_alpha.numpy())
+
+
 def summary_noop(*__args, **__kwargs):  # type: ignore
     pass
 
@@ -458,15 +656,6 @@ def get_sigusr1_handler(base_dir):
     return h
 
 
-def cleanup(*args):
-    import gc
-
-    for arg in args:
-        del arg
-    gc.collect()
-    torch.cuda.empty_cache()
-
-
 if __name__ == "__main__":
     from icecream import ic, install
 
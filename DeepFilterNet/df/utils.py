@@ -1,17 +1,16 @@
 import collections
+import itertools
 import math
 import os
 import random
 import subprocess
-import warnings
 from socket import gethostname
-from typing import Any, Set, Union
+from typing import Any, Iterable, List, Set, Tuple, Union
 
 import numpy as np
 import torch
 from loguru import logger
 from torch import Tensor
-from torch._six import string_classes
 from torch.types import Number
 
 from df.config import config
@@ -22,6 +21,11 @@ try:
 except ImportError:
     from torchaudio.compliance.kaldi import resample_waveform as ta_resample  # type: ignore
 
+try:
+    from torch._six import string_classes
+except ImportError:  # torch >= 2.0
+    string_classes = (str, bytes)
+
 
 def resample(audio: Tensor, orig_sr: int, new_sr: int, method="sinc_fast"):
     params = {
@@ -75,12 +79,21 @@ def as_real(x: Tensor):
 def check_finite_module(obj, name="Module", _raise=True) -> Set[str]:
     out: Set[str] = set()
     if isinstance(obj, torch.nn.Module):
-        for name, child in obj.named_children():
-            out = out | check_finite_module(child, name)
-        for name, param in obj.named_parameters():
-            out = out | check_finite_module(param, name)
-        for name, buf in obj.named_buffers():
-            out = out | check_finite_module(buf, name)
+        named = [
+            (n, t.detach())
+            for n, t in itertools.chain(obj.named_parameters(), obj.named_buffers())
+            if t.is_floating_point() and t.numel() > 0
+        ]
+        if len(named) > 0:
+            tensors = [t for _, t in named]
+            # The infinity norm is non-finite iff any element is non-finite
+            if hasattr(torch, "_foreach_norm"):
+                norms = torch._foreach_norm(tensors, math.inf)
+            else:
+                norms = [t.abs().max() for t in tensors]
+            device = norms[0].device
+            finite = torch.isfinite(torch.stack([n.to(device) for n in norms])).tolist()
+            out = {n for (n, _), is_finite in zip(named, finite) if not is_finite}
     if _raise and len(out) > 0:
         raise ValueError(f"{name} not finite during checkpoint writing including: {out}")
     return out
@@ -176,6 +189,7 @@ def clip_grad_norm_(
 
     The norm is computed over all gradients together, as if they were
     concatenated into a single vector. Gradients are modified in-place.
+    Per-gradient norms and the scaling use the multi-tensor `_foreach` kernels if available.
 
     Args:
         parameters (Iterable[Tensor] or Tensor): an iterable of Tensors or a
@@ -192,41 +206,38 @@ def clip_grad_norm_(
     """
     if isinstance(parameters, torch.Tensor):
         parameters = [parameters]
-    parameters = [p for p in parameters if p.grad is not None]
+    grads = [p.grad.detach() for p in parameters if p.grad is not None]
     max_norm = float(max_norm)
     norm_type = float(norm_type)
-    if len(parameters) == 0:
+    if len(grads) == 0:
         return torch.tensor(0.0)
-    device = parameters[0].grad.device
-    if norm_type == torch._six.inf:
-        norms = [p.grad.detach().abs().max().to(device) for p in parameters]
+    device = grads[0].device
+    if hasattr(torch, "_foreach_norm"):
+        norms = torch._foreach_norm(grads, norm_type)
+    elif norm_type == math.inf:
+        norms = [g.abs().max() for g in grads]
+    else:
+        norms = [torch.norm(g, norm_type) for g in grads]
+    norms = [n.to(device) for n in norms]
+    if norm_type == math.inf:
         total_norm = norms[0] if len(norms) == 1 else torch.max(torch.stack(norms))
     else:
-        total_norm = torch.norm(
-            torch.stack([torch.norm(p.grad.detach(), norm_type).to(device) for p in parameters]),
-            norm_type,
+        total_norm = torch.norm(torch.stack(norms), norm_type)
+    if error_if_nonfinite and not torch.isfinite(total_norm):
+        raise RuntimeError(
+            f"The total norm of order {norm_type} for gradients from "
+            "`parameters` is non-finite, so it cannot be clipped. To disable "
+            "this error and scale the gradients by the non-finite norm anyway, "
+            "set `error_if_nonfinite=False`"
         )
-    if total_norm.isnan() or total_norm.isinf():
-        if error_if_nonfinite:
-            raise RuntimeError(
-                f"The total norm of order {norm_type} for gradients from "
-                "`parameters` is non-finite, so it cannot be clipped. To disable "
-                "this error and scale the gradients by the non-finite norm anyway, "
-                "set `error_if_nonfinite=False`"
-            )
-        else:
-            warnings.warn(
-                "Non-finite norm encountered in torch.nn.utils.clip_grad_norm_; continuing anyway. "
-                "Note that the default behavior will change in a future release to error out "
-                "if a non-finite total norm is encountered. At that point, setting "
-                "error_if_nonfinite=false will be required to retain the old behavior.",
-                FutureWarning,
-                stacklevel=2,
-            )
-    clip_coef = max_norm / (total_norm + 1e-6)
-    if clip_coef < 1:
-        for p in parameters:
-            p.grad.detach().mul_(clip_coef.to(p.grad.device))
+    # Clamp instead of a conditional to avoid a device synchronization
+    clip_coef = (max_norm / (total_norm + 1e-6)).clamp(max=1.0)
+    try:
+        torch._foreach_mul_(grads, clip_coef)
+    except (AttributeError, TypeError, RuntimeError):
+        # Older torch versions do not support a tensor as foreach scalar
+        for g in grads:
+            g.mul_(clip_coef.to(g.device))
     return total_norm
 
 
@@ -257,3 +268,30 @@ def detach_hidden(hidden: Any) -> Any:
     vector.
     """
     return apply_to_tensor(hidden, Tensor.detach)
+
+
+def get_hidden_refs(
+    module: torch.nn.Module, names: Iterable[str] = ("hidden", "h0")
+) -> List[Tuple[torch.nn.Module, str]]:
+    """Collect all (module, attribute name) pairs of hidden states stored within the module.
+
+    Parameters and buffers are not considered hidden states.
+    """
+    refs = []
+    for mod in module.modules():
+        tensors = dict(mod.named_parameters(recurse=False))
+        tensors.update(mod.named_buffers(recurse=False))
+        for name in names:
+            if name in tensors or not hasattr(mod, name):
+                continue
+            h = getattr(mod, name)
+            if h is None or isinstance(h, Tensor):
+                refs.append((mod, name))
+    return refs
+
+
+def detach_hidden_refs(refs: List[Tuple[torch.nn.Module, str]]):
+    """Cut backpropagation graph of the hidden states collected via `get_hidden_refs`."""
+    for mod, name in refs:
+        h = getattr(mod, name)
+        setattr(mod, name, h.detach() if h is not None else None)
@@ -0,0 +1,81 @@
+import math
+
+import pytest
+import torch
+from torch import nn
+
+from df.utils import check_finite_module, clip_grad_norm_, detach_hidden_refs, get_hidden_refs
+
+
+def _model_with_grads(seed: int = 0) -> nn.Module:
+    torch.manual_seed(seed)
+    model = nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 4))
+    model(torch.randn(3, 8)).square().sum().mul(100).backward()
+    return model
+
+
+@pytest.mark.parametrize("norm_type", [2.0, math.inf])
+@pytest.mark.parametrize("max_norm", [1e-3, 1e6])
+def test_clip_grad_norm(norm_type: float, max_norm: float):
+    model = _model_with_grads()
+    expected = _model_with_grads()
+    total = clip_grad_norm_(model.parameters(), max_norm, norm_type=norm_type)
+    total_ref = torch.nn.utils.clip_grad_norm_(expected.parameters(), max_norm, norm_type)
+    torch.testing.assert_close(total, total_ref)
+    for p, p_ref in zip(model.parameters(), expected.parameters()):
+        torch.testing.assert_close(p.grad, p_ref.grad)
+
+
+def test_clip_grad_norm_no_tensor_scalar(monkeypatch):
+    """Older torch versions do not accept a tensor as scalar argument of `_foreach_mul_`."""
+    foreach_mul_ = torch._foreach_mul_
+
+    def _foreach_mul_scalar_only(tensors, scalar):
+        if isinstance(scalar, torch.Tensor):
+            raise TypeError("_foreach_mul_(): argument 'scalar' must be Number, not Tensor")
+        return foreach_mul_(tensors, scalar)
+
+    expected = _model_with_grads()
+    torch.nn.utils.clip_grad_norm_(expected.parameters(), 1e-3)
+    monkeypatch.setattr(torch, "_foreach_mul_", _foreach_mul_scalar_only)
+    model = _model_with_grads()
+    clip_grad_norm_(model.parameters(), 1e-3)
+    for p, p_ref in zip(model.parameters(), expected.parameters()):
+        torch.testing.assert_close(p.grad, p_ref.grad)
+
+
+def test_clip_grad_norm_non_finite():
+    model = _model_with_grads()
+    model[0].weight.grad[0, 0] = float("nan")
+    with pytest.raises(RuntimeError, match="non-finite"):
+        clip_grad_norm_(model.parameters(), 1.0, error_if_nonfinite=True)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_check_finite_module(value: float):
+    model = _model_with_grads()
+    assert check_finite_module(model) == set()
+    with torch.no_grad():
+        model[2].bias[1] = value
+    assert check_finite_module(model, _raise=False) == {"2.bias"}
+    with pytest.raises(ValueError):
+        check_finite_module(model)
+
+
+def test_detach_hidden_refs():
+    class Rnn(nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.gru = nn.GRU(4, 4)
+            self.h0 = nn.Parameter(torch.zeros(1, 1, 4))
+            self.hidden = None
+
+    model = nn.Sequential(Rnn())
+    # Parameters are not considered hidden states
+    refs = get_hidden_refs(model)
+    assert refs == [(model[0], "hidden")]
+    model[0].hidden = torch.ones(1, requires_grad=True) * 2
+    assert model[0].hidden.requires_grad
+    detach_hidden_refs(refs)
+    assert not model[0].hidden.requires_grad
+    assert isinstance(model[0].h0, nn.Parameter)
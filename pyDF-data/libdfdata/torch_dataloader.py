@@ -14,7 +14,7 @@ from libdfdata import _FdDataLoader
 
 
 class Batch:
-    def __init__(self, b: Tuple[np.ndarray, ...]):
+    def __init__(self, b: Tuple[np.ndarray, ...], output_real_view: bool = False):
         # Pytorch complains that the returned numpy arrays are not writable. Since they were
         # allocated within the python GIL and their content is only used for this batch, it is
         # safe to assume writable.
@@ -36,6 +36,11 @@ class Batch:
             self.speech = torch.from_numpy(speech)
             self.noise = torch.from_numpy(noise)
             self.noisy = torch.from_numpy(noisy)
+            if output_real_view and self.noisy.is_complex():
+                # Complex spectrograms as real tensors with real/imag in the last dimension
+                self.noisy = torch.view_as_real(self.noisy)
+                if self.feat_spec is not None:
+                    self.feat_spec = torch.view_as_real(self.feat_spec)
             self.lengths = torch.from_numpy(lengths.astype(np.int64)).long()
             self.snr = torch.from_numpy(snr)
             self.gain = torch.from_numpy(gain)
@@ -88,6 +93,7 @@ class PytorchDataLoader:
         overfit=False,  # Overfit on one epoch
         seed=0,
         min_nb_erb_freqs: int = None,  # Minimum number of frequency bins per ERB band
+        output_real_view: bool = False,  # Return noisy and feat_spec as real views (..., 2)
     ):
         self.fft_size = fft_size
         self.batch_size = batch_size
@@ -117,6 +123,7 @@ class PytorchDataLoader:
             min_nb_erb_freqs=min_nb_erb_freqs,
         )
         self.prefetch = prefetch
+        self.output_real_view = output_real_view
         self.pin_memory = pin_memory if torch.cuda.is_available() else False
         self.idx = 0
         self.worker_out_queue = self._get_worker_queue_dummy()
@@ -179,7 +186,7 @@ class PytorchDataLoader:
                 idx = 0
                 try:
                     idx, batch = self.idx, self.loader.get_batch()
-                    batch = Batch(batch)
+                    batch = Batch(batch, output_real_view=self.output_real_view)
                 except RuntimeError as e:
                     self.loader.cleanup()
                     if str(e) == "DF dataloader error: TimeoutError":